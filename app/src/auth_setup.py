@@ -4,26 +4,27 @@ Google OAuth Setup Helper
 This script helps users set up Google API authentication
 """
 
-import json
 import os
+import sys
 import asyncio
+import threading
 import webbrowser
 import urllib.parse
 import time
-import threading
 from pathlib import Path
+from typing import Any, Dict, Tuple
 from http.server import HTTPServer, BaseHTTPRequestHandler
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import Flow
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
 
+import orjson
+
+# Google client libraries are imported inside the methods that use them so that
+# importing this module stays cheap for processes that never run the setup flow
 
-SCOPES = [
+
+SCOPES = (
     'https://www.googleapis.com/auth/gmail.readonly',
     'https://www.googleapis.com/auth/calendar.readonly'
-]
+)
 
 # Get the directory where this script is located
 SCRIPT_DIR = Path(__file__).parent
@@ -33,9 +34,92 @@ CREDENTIALS_PATH = SCRIPT_DIR / 'config' / 'credentials.json'
 # Global variable to store authorization code
 authorization_code = None
 
+# Multi-line console messages, each emitted with a single write
+_SETUP_INSTRUCTIONS = (
+    '\n📋 Setup Instructions:\n'
+    '1. Go to https://console.cloud.google.com\n'
+    '2. Create a new project or select existing one\n'
+    '3. Enable Gmail API and Calendar API\n'
+    '4. Create OAuth 2.0 credentials for desktop application\n'
+    '5. In the OAuth consent screen, add these redirect URIs:\n'
+    '   - http://localhost:8080\n'
+    '6. Download the credentials.json file\n'
+    '7. Place it in the src/config/ directory\n'
+    '8. Run this script again\n\n'
+)
+
+_BROWSER_INSTRUCTIONS = (
+    '\n🌐 Opening browser for Google OAuth authorization...\n'
+    '📋 Instructions:\n'
+    '1. Your browser will open automatically\n'
+    '2. Sign in to your Google account if prompted\n'
+    '3. Grant the requested permissions\n'
+    '4. You will be redirected back automatically\n'
+    '5. Wait for the success message\n\n'
+)
+
+_TROUBLESHOOTING_TIPS = (
+    '\n💡 Troubleshooting tips:\n'
+    '- Make sure no other application is using port 8080\n'
+    '- Check that your firewall allows the connection\n'
+    '- Verify the redirect URI (http://localhost:8080) is configured in Google Cloud Console\n'
+    '- Make sure you created a Web Application (not Desktop) in Google Cloud Console\n'
+)
+
+
+def _write(text):
+    """Write a precomputed console message in one call"""
+    sys.stdout.write(text)
+    sys.stdout.flush()
+
+
+# Parsed JSON files keyed by path, stored with the (st_mtime_ns, st_size) they were read at
+_JSON_CACHE: Dict[Path, Tuple[int, int, Any]] = {}
+
+
+def _read_json(path: Path) -> Any:
+    """Read a JSON file, reusing the parsed result while the file is unchanged.
+
+    The returned object is shared with the cache and must not be mutated.
+    """
+    st = path.stat()
+    cached = _JSON_CACHE.get(path)
+    if cached and cached[0] == st.st_mtime_ns and cached[1] == st.st_size:
+        return cached[2]
+
+    with open(path, 'rb') as f:
+        data = orjson.loads(f.read())
+
+    _JSON_CACHE[path] = (st.st_mtime_ns, st.st_size, data)
+    return data
+
+
+def _serialize_token(credentials) -> bytes:
+    """Serialize credentials to the same JSON document as Credentials.to_json, using orjson"""
+    info = {
+        'token': credentials.token,
+        'refresh_token': credentials.refresh_token,
+        'token_uri': credentials.token_uri,
+        'client_id': credentials.client_id,
+        'client_secret': credentials.client_secret,
+        'scopes': list(credentials.scopes) if credentials.scopes is not None else None,
+        'rapt_token': credentials.rapt_token,
+        'universe_domain': credentials.universe_domain,
+        'account': credentials.account,
+    }
+    if credentials.expiry:
+        info['expiry'] = credentials.expiry.isoformat() + 'Z'
+
+    return orjson.dumps({key: value for key, value in info.items() if value is not None})
+
+
 class OAuthCallbackHandler(BaseHTTPRequestHandler):
     """HTTP request handler for OAuth callback"""
     
+    # Socket timeout for accepted connections, so an idle connection (e.g. a browser
+    # preconnect) cannot block handle_request() past the authorization deadline
+    timeout = 10
+    
     def do_GET(self):
         global authorization_code
         
@@ -98,9 +182,28 @@ class GoogleAuthSetup:
     def __init__(self):
         self.flow = None
         self.credentials = None
+        # Token refresh transport, created on first use and reused for every refresh
+        self._transport = None
+
+    def _get_transport(self):
+        """Return the shared refresh transport backed by a pooled requests.Session"""
+        if self._transport is None:
+            import requests
+            from google.auth.transport.requests import Request
+
+            self._transport = Request(session=requests.Session())
+        return self._transport
+
+    async def aclose(self):
+        """Close the pooled HTTP session used for token refreshes"""
+        if self._transport is not None:
+            self._transport.session.close()
+            self._transport = None
 
     async def initialize(self):
         """Initialize OAuth2 flow"""
+        from google_auth_oauthlib.flow import Flow
+
         try:
             # Read credentials file
             credentials_info = await self.load_credentials()
@@ -123,33 +226,33 @@ class GoogleAuthSetup:
     async def load_credentials(self):
         """Load credentials from file"""
         try:
-            if not CREDENTIALS_PATH.exists():
-                print(f'❌ Credentials file not found: {CREDENTIALS_PATH}')
-                return None
-            
-            with open(CREDENTIALS_PATH, 'r', encoding='utf-8') as f:
-                credentials_info = json.load(f)
-            
-            return credentials_info
+            return await asyncio.to_thread(_read_json, CREDENTIALS_PATH)
+        except FileNotFoundError:
+            print(f'❌ Credentials file not found: {CREDENTIALS_PATH}')
+            return None
         except Exception as error:
             print(f'❌ Could not read credentials file: {error}')
             return None
 
     async def check_existing_token(self):
         """Check if valid token already exists"""
+        from google.oauth2.credentials import Credentials
+
         try:
-            if not TOKEN_PATH.exists():
+            # Load existing credentials; the stat inside _read_json doubles as the existence check
+            try:
+                token_info = await asyncio.to_thread(_read_json, TOKEN_PATH)
+            except FileNotFoundError:
                 print('ℹ️  No existing token found, will create new one')
                 return False
 
-            # Load existing credentials
-            self.credentials = Credentials.from_authorized_user_file(str(TOKEN_PATH), SCOPES)
+            self.credentials = Credentials.from_authorized_user_info(token_info, SCOPES)
             
             # Check if credentials are valid
             if not self.credentials or not self.credentials.valid:
                 if self.credentials and self.credentials.expired and self.credentials.refresh_token:
                     print('ℹ️  Token expired, attempting to refresh...')
-                    self.credentials.refresh(Request())
+                    await asyncio.to_thread(self.credentials.refresh, self._get_transport())
                     # Save refreshed token
                     await self.save_token(self.credentials)
                     print('✅ Token refreshed successfully')
@@ -165,20 +268,49 @@ class GoogleAuthSetup:
             print('ℹ️  Will create new token')
             return False
 
-    def get_access_token(self):
-        """Get access token using manual local server"""
+    async def get_access_token(self, mode='browser'):
+        """Get access token using the local callback server or a pasted authorization code"""
+        try:
+            if mode == 'paste':
+                # input() stays on the main thread so Ctrl-C can interrupt it
+                code = self._prompt_for_code()
+            else:
+                # The callback wait runs in a worker thread, which Ctrl-C cannot
+                # interrupt, so signal it to stop when the task is cancelled
+                stop = threading.Event()
+                try:
+                    code = await asyncio.to_thread(self._wait_for_browser_code, stop)
+                except (asyncio.CancelledError, KeyboardInterrupt):
+                    stop.set()
+                    raise
+            
+            print('✅ Authorization code received!')
+            
+            # Exchange code for token without blocking the event loop
+            await asyncio.to_thread(self.flow.fetch_token, code=code)
+            self.credentials = self.flow.credentials
+            
+            print(f'✅ Token obtained successfully!')
+            return self.credentials
+            
+        except Exception as error:
+            print(f'❌ Error retrieving access token: {error}')
+            _write(_TROUBLESHOOTING_TIPS)
+            raise
+
+    def _wait_for_browser_code(self, stop):
+        """Open the browser and wait for the OAuth callback until stop is set"""
         global authorization_code
         authorization_code = None
         
+        print('\n🔗 Starting local server for OAuth callback...')
+        
+        # Start local server; requests are served one at a time on this worker thread.
+        # Bind the IPv4 loopback literal so no name lookup is needed (HTTPServer is
+        # IPv4-only and already sets SO_REUSEADDR, so quick retries can rebind the port)
+        server = HTTPServer(('127.0.0.1', 8080), OAuthCallbackHandler)
+        
         try:
-            print('\n🔗 Starting local server for OAuth callback...')
-            
-            # Start local server
-            server = HTTPServer(('localhost', 8080), OAuthCallbackHandler)
-            server_thread = threading.Thread(target=server.serve_forever)
-            server_thread.daemon = True
-            server_thread.start()
-            
             print('✅ Local server started on http://localhost:8080')
             
             # Generate authorization URL
@@ -187,76 +319,94 @@ class GoogleAuthSetup:
                 prompt='consent'
             )
             
-            print('\n🌐 Opening browser for Google OAuth authorization...')
-            print('📋 Instructions:')
-            print('1. Your browser will open automatically')
-            print('2. Sign in to your Google account if prompted')
-            print('3. Grant the requested permissions')
-            print('4. You will be redirected back automatically')
-            print('5. Wait for the success message\n')
+            _write(_BROWSER_INSTRUCTIONS)
             
             # Open browser
             webbrowser.open(auth_url)
             
-            # Wait for authorization code
+            # Serve callback requests until the handler stores the code, stop is set or the timeout expires
             print('⏳ Waiting for authorization...')
             timeout = 120  # 2 minutes timeout
-            elapsed = 0
+            started = time.monotonic()
+            last_report = started
             
-            while authorization_code is None and elapsed < timeout:
-                time.sleep(1)
-                elapsed += 1
+            while authorization_code is None and not stop.is_set():
+                remaining = timeout - (time.monotonic() - started)
+                if remaining <= 0:
+                    break
+                
+                # handle_request returns after one request or once server.timeout elapses;
+                # keep it short so a stop request ends the wait promptly
+                server.timeout = min(0.5, remaining)
+                server.handle_request()
                 
-                if elapsed % 10 == 0:
+                # Report progress at most every 10 s, not after every stray request
+                now = time.monotonic()
+                if authorization_code is None and now - last_report >= 10:
+                    last_report = now
+                    elapsed = min(timeout, round(now - started))
                     print(f'⏳ Still waiting... ({elapsed}/{timeout}s)')
-            
-            # Stop the server
-            server.shutdown()
+        finally:
+            # Release the port even if something above failed
             server.server_close()
-            
-            if authorization_code is None:
-                raise Exception('Authorization timeout. Please try again.')
-            
-            print('✅ Authorization code received!')
-            
-            # Exchange code for token
-            self.flow.fetch_token(code=authorization_code)
-            self.credentials = self.flow.credentials
-            
-            print(f'✅ Token obtained successfully!')
-            return self.credentials
-            
-        except Exception as error:
-            print(f'❌ Error retrieving access token: {error}')
-            print('\n💡 Troubleshooting tips:')
-            print('- Make sure no other application is using port 8080')
-            print('- Check that your firewall allows the connection')
-            print('- Verify the redirect URI (http://localhost:8080) is configured in Google Cloud Console')
-            print('- Make sure you created a Web Application (not Desktop) in Google Cloud Console')
-            raise
+        
+        if authorization_code is None:
+            if stop.is_set():
+                raise Exception('Authorization cancelled.')
+            raise Exception('Authorization timeout. Please try again.')
+        
+        return authorization_code
+
+    def _prompt_for_code(self):
+        """Print the authorization URL and read the code pasted back by the user"""
+        auth_url, _ = self.flow.authorization_url(
+            access_type='offline',
+            prompt='consent'
+        )
+        
+        print('\n🌐 Open this URL in your browser to authorize access:')
+        print(auth_url)
+        print('\n📋 After granting access, copy the "code" value from the redirected URL')
+        
+        code = input('🔑 Enter the authorization code: ').strip()
+        
+        # Accept the whole redirected URL as well as the bare code
+        params = urllib.parse.parse_qs(urllib.parse.urlparse(code).query)
+        if 'code' in params:
+            code = params['code'][0]
+        
+        if not code:
+            raise Exception('No authorization code entered. Please try again.')
+        return code
 
     async def save_token(self, credentials):
         """Save token to file"""
         # Create config directory if it doesn't exist
-        TOKEN_PATH.parent.mkdir(parents=True, exist_ok=True)
+        await asyncio.to_thread(TOKEN_PATH.parent.mkdir, parents=True, exist_ok=True)
         
-        # Save credentials to file
-        with open(TOKEN_PATH, 'w', encoding='utf-8') as f:
-            f.write(credentials.to_json())
+        # Save credentials to file off the event loop
+        await asyncio.to_thread(TOKEN_PATH.write_bytes, _serialize_token(credentials))
 
     async def test_connection(self):
         """Test API connections"""
+        from googleapiclient.discovery import build
+        from googleapiclient.errors import HttpError
+
         try:
-            print('\n🧪 Testing Gmail API connection...')
-            gmail_service = build('gmail', 'v1', credentials=self.credentials)
+            print('\n🧪 Testing Gmail and Calendar API connections...')
+            # Use the discovery documents bundled with google-api-python-client instead of fetching them
+            gmail_service = build('gmail', 'v1', credentials=self.credentials,
+                                  static_discovery=True, cache_discovery=False)
+            calendar_service = build('calendar', 'v3', credentials=self.credentials,
+                                     static_discovery=True, cache_discovery=False)
             
-            profile = gmail_service.users().getProfile(userId='me').execute()
+            # Each service has its own HTTP connection, so both round trips can run concurrently
+            profile, calendars = await asyncio.gather(
+                asyncio.to_thread(gmail_service.users().getProfile(userId='me').execute),
+                asyncio.to_thread(calendar_service.calendarList().list().execute)
+            )
             print(f'✅ Gmail API test successful! Email: {profile["emailAddress"]}')
 
-            print('\n🧪 Testing Calendar API connection...')
-            calendar_service = build('calendar', 'v3', credentials=self.credentials)
-            
-            calendars = calendar_service.calendarList().list().execute()
             calendar_count = len(calendars.get('items', []))
             print(f'✅ Calendar API test successful! Found {calendar_count} calendars')
 
@@ -268,23 +418,14 @@ class GoogleAuthSetup:
             print(f'❌ Unexpected error during API test: {error}')
             return False
 
-    async def run(self):
+    async def run(self, mode='browser'):
         """Run the complete setup process"""
         print('🚀 Google API Authentication Setup\n')
 
         # Initialize OAuth flow
         initialized = await self.initialize()
         if not initialized:
-            print('\n📋 Setup Instructions:')
-            print('1. Go to https://console.cloud.google.com')
-            print('2. Create a new project or select existing one')
-            print('3. Enable Gmail API and Calendar API')
-            print('4. Create OAuth 2.0 credentials for desktop application')
-            print('5. In the OAuth consent screen, add these redirect URIs:')
-            print('   - http://localhost:8080')
-            print('6. Download the credentials.json file')
-            print('7. Place it in the src/config/ directory')
-            print('8. Run this script again\n')
+            _write(_SETUP_INSTRUCTIONS)
             return
 
         # Check for existing token
@@ -301,9 +442,9 @@ class GoogleAuthSetup:
             else:
                 print('\n⚠️  Existing token seems invalid. Creating new one...')
 
-        # Get new token using local server
+        # Get new token using local server (or a pasted code)
         try:
-            self.get_access_token()
+            await self.get_access_token(mode)
             # Save token to file
             await self.save_token(self.credentials)
             
@@ -322,7 +463,11 @@ class GoogleAuthSetup:
 async def main():
     """Main function"""
     setup = GoogleAuthSetup()
-    await setup.run()
+    mode = 'paste' if '--paste' in sys.argv[1:] else 'browser'
+    try:
+        await setup.run(mode)
+    finally:
+        await setup.aclose()
 
 
 if __name__ == '__main__':
@@ -3,10 +3,61 @@
 Echo Test Server - Based on FastMCP examples
 """
 
+import orjson
 from fastmcp import FastMCP
 
+
+def _serialize_result(data) -> str:
+    """Serialize tool results with orjson
+
+    orjson raises TypeError for types it cannot encode (e.g. pydantic models),
+    in which case FastMCP falls back to its default serializer.
+    """
+    return orjson.dumps(data).decode()
+
+
 # Create server
-mcp = FastMCP("Echo Test Server")
+mcp = FastMCP("Echo Test Server", tool_serializer=_serialize_result)
+
+# Mock data never changes, so build it once and hand out copies of the outer list
+_EMAILS_TEMPLATE = (
+    {
+        "id": "1",
+        "subject": "Test Email 1",
+        "from": "test1@example.com",
+        "date": "2025-01-01T10:00:00Z",
+        "snippet": "This is a test email",
+        "body": "This is the body of test email 1"
+    },
+)
+
+_EVENTS_TEMPLATE = (
+    {
+        "id": "event1",
+        "title": "Test Meeting",
+        "description": "This is a test meeting",
+        "start": "2025-01-02T14:00:00Z",
+        "end": "2025-01-02T15:00:00Z",
+        "location": "Conference Room A",
+        "attendees": ["attendee1@example.com"]
+    },
+)
+
+_RESULT_TEMPLATE = {"link": "https://example.com"}
+
+_SUMMARY_PREFIX = "📧 Email Summary: Found "
+_SUMMARY_SUFFIX = (
+    " emails. "
+    "Key topics include: test communications, mock data, and server testing. "
+    "No urgent actions required at this time."
+)
+
+_ANALYSIS_PREFIX = "📅 Calendar Analysis: You have "
+_ANALYSIS_SUFFIX = (
+    " upcoming events. "
+    "Your schedule looks manageable with good time distribution. "
+    "Consider blocking time for focused work between meetings."
+)
 
 @mcp.tool
 def echo_tool(text: str) -> str:
@@ -18,16 +69,7 @@ def get_recent_emails(maxResults: int = 50) -> dict:
     """Get recent emails - mock implementation"""
     return {
         "success": True,
-        "emails": [
-            {
-                "id": "1",
-                "subject": "Test Email 1", 
-                "from": "test1@example.com",
-                "date": "2025-01-01T10:00:00Z",
-                "snippet": "This is a test email",
-                "body": "This is the body of test email 1"
-            }
-        ],
+        "emails": list(_EMAILS_TEMPLATE),
         "count": min(maxResults, 1),
         "total_found": 1
     }
@@ -37,17 +79,7 @@ def get_upcoming_events(days: int = 7) -> dict:
     """Get upcoming events - mock implementation"""
     return {
         "success": True,
-        "events": [
-            {
-                "id": "event1",
-                "title": "Test Meeting",
-                "description": "This is a test meeting",
-                "start": "2025-01-02T14:00:00Z",
-                "end": "2025-01-02T15:00:00Z",
-                "location": "Conference Room A",
-                "attendees": ["attendee1@example.com"]
-            }
-        ],
+        "events": list(_EVENTS_TEMPLATE),
         "count": min(days, 1)  # Use the days parameter
     }
 
@@ -58,7 +90,7 @@ def search_web_insights(query: str, context: str = "") -> dict:
         "success": True,
         "results": [{
             "title": f"Results for: {query}",
-            "link": "https://example.com",
+            **_RESULT_TEMPLATE,
             "snippet": f"Mock results for '{query}' with context: {context}"
         }],
         "query": query,
@@ -74,9 +106,7 @@ def summarize_emails_ai(emails: list) -> dict:
             "error": "No emails provided for summarization"
         }
     
-    summary = f"📧 Email Summary: Found {len(emails)} emails. "
-    summary += "Key topics include: test communications, mock data, and server testing. "
-    summary += "No urgent actions required at this time."
+    summary = "".join((_SUMMARY_PREFIX, str(len(emails)), _SUMMARY_SUFFIX))
     
     return {
         "success": True,
@@ -93,9 +123,7 @@ def analyze_calendar_ai(events: list) -> dict:
             "error": "No events provided for analysis"
         }
     
-    analysis = f"📅 Calendar Analysis: You have {len(events)} upcoming events. "
-    analysis += "Your schedule looks manageable with good time distribution. "
-    analysis += "Consider blocking time for focused work between meetings."
+    analysis = "".join((_ANALYSIS_PREFIX, str(len(events)), _ANALYSIS_SUFFIX))
     
     return {
         "success": True,
@@ -105,4 +133,4 @@ def analyze_calendar_ai(events: list) -> dict:
 
 # Run server
 if __name__ == "__main__":
-    mcp.run()
\ No newline at end of file
+    mcp.run()
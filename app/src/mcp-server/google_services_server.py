@@ -5,35 +5,74 @@ FastMCP v2 implementation with Google APIs and Groq AI
 """
 
 import asyncio
-import base64
+import hashlib
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, List, Optional, Tuple
+
+# SIMD-accelerated base64 when available, otherwise the stdlib implementation
+try:
+    import pybase64 as b64
+except ImportError:
+    import base64 as b64
+
+# Cache imports
+from cachetools import LRUCache, TTLCache
+import orjson
 
 # FastMCP imports
-from fastmcp import FastMCP
+from fastmcp import Context, FastMCP
 
 # Google API imports
+import httplib2
 from google.auth.transport.requests import Request
+from google_auth_httplib2 import AuthorizedHttp
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from googleapiclient.discovery import build
 from googleapiclient.errors import HttpError
+from googleapiclient.model import JsonModel
 
 # Groq imports
-from groq import Groq
+from groq import AsyncGroq
 from dotenv import load_dotenv
 
 # Load environment variables
-load_dotenv(Path(__file__).parent.parent.parent / '.env')
+ENV_FILE = Path(__file__).parent.parent.parent / '.env'
+load_dotenv(ENV_FILE)
 
 # Configuration
-SCOPES = [
+SCOPES = (
     'https://www.googleapis.com/auth/gmail.readonly',
     'https://www.googleapis.com/auth/calendar.readonly'
-]
+)
+
+# Groq prompts, built once instead of on every tool call
+SUMMARIZE_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are an AI assistant that helps summarize emails efficiently. Provide a clear, organized summary of the key points from the emails, grouping similar topics together and highlighting important items that need attention."
+}
+SUMMARIZE_PROMPT_PREFIX = "Please summarize these emails from the last 24 hours. Focus on the most important items and group similar topics:\n\n"
+SUMMARIZE_MERGE_PROMPT_PREFIX = "Combine these partial summaries of emails from the last 24 hours into one summary. Focus on the most important items and group similar topics:\n\n"
+
+ANALYZE_SYSTEM_MESSAGE = {
+    "role": "system",
+    "content": "You are an AI assistant that analyzes calendar events and provides helpful insights, time management suggestions, and preparation recommendations. Focus on identifying important meetings, potential conflicts, preparation needs, and optimization opportunities."
+}
+ANALYZE_PROMPT_PREFIX = "Analyze these upcoming calendar events and provide insights, suggestions, and recommendations for better time management and preparation:\n\n"
+
+# Headers requested when message bodies are not needed
+EMAIL_METADATA_HEADERS = ['Subject', 'From', 'Date']
+
+# Gmail recommends at most 50 calls per batch request
+EMAIL_BATCH_SIZE = 50
+
+# With includeBody, only this many messages (unread first) are re-fetched in full
+MAX_BODY_FETCH = 10
 
 CONFIG_DIR = Path(__file__).parent.parent / 'config'
 CREDENTIALS_FILE = CONFIG_DIR / 'credentials.json'
@@ -47,15 +86,120 @@ gmail_service = None
 calendar_service = None
 groq_client = None
 
+# Blocking googleapiclient calls run off the event loop. httplib2 connections are not
+# thread-safe, so a single worker serializes them while the loop keeps serving other tools.
+google_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='google-api')
+
+# Serializes first-time service initialization across concurrent tool calls
+init_lock = asyncio.Lock()
+
+# Gmail listings change slowly, so reuse them for a few minutes (keyed by maxResults).
+# Labels such as UNREAD change, so metadata expires with the listing; message bodies
+# are immutable and kept until evicted.
+email_list_cache = TTLCache(maxsize=64, ttl=300)
+email_metadata_cache = TTLCache(maxsize=2048, ttl=300)
+email_message_cache = LRUCache(maxsize=2048)
+
+# Groq completions keyed by (tool, prompt fingerprint), so re-running a tool on the
+# same emails or events skips the LLM round trip
+ai_response_cache = LRUCache(maxsize=256)
+
 # Initialize Groq client
 groq_api_key = os.getenv('GROQ_API_KEY')
 if groq_api_key:
-    groq_client = Groq(api_key=groq_api_key)
+    groq_client = AsyncGroq(api_key=groq_api_key)
+
+# Caps concurrent Groq requests so chunked summaries stay within rate limits
+groq_semaphore = asyncio.Semaphore(4)
+
+# Large email sets are summarized in chunks concurrently, then merged
+SUMMARY_CHUNK_THRESHOLD = 20
+SUMMARY_CHUNK_SIZE = 10
+
+
+class OrjsonModel(JsonModel):
+    """JsonModel that parses and serializes API bodies with orjson instead of stdlib json"""
+    
+    def serialize(self, body_value):
+        if isinstance(body_value, dict) and 'data' not in body_value and self._data_wrapper:
+            body_value = {'data': body_value}
+        return orjson.dumps(body_value).decode()
+    
+    def deserialize(self, content):
+        try:
+            body = orjson.loads(content)
+        except orjson.JSONDecodeError:
+            # Match JsonModel: non-JSON bodies are returned as text
+            return content.decode('utf-8') if isinstance(content, bytes) else content
+        if self._data_wrapper and 'data' in body:
+            body = body['data']
+        return body
+
+
+async def run_google_call(func, *args):
+    """Run a blocking Google API call on the Google worker thread"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(google_executor, func, *args)
+
+
+async def ensure_google_services() -> bool:
+    """Initialize Google services once, even when several tools start concurrently"""
+    if gmail_service and calendar_service:
+        return True
+    
+    async with init_lock:
+        # Another coroutine may have finished initialization while we waited
+        if gmail_service and calendar_service:
+            return True
+        return await initialize_google_services()
+
+
+def prompt_fingerprint(text: str) -> str:
+    """Return a compact hash of the prompt text used as an AI response cache key"""
+    return hashlib.blake2b(text.encode('utf-8'), digest_size=16).hexdigest()
+
+
+async def groq_complete(system_message: Dict[str, str], user_prompt: str, temperature: float,
+                        ctx: Optional[Context] = None) -> str:
+    """Run one Groq chat completion and return its text
+
+    When a tool context is given the completion is streamed and each received
+    piece is forwarded to the client as a progress notification.
+    """
+    async with groq_semaphore:
+        response = await groq_client.chat.completions.create(
+            messages=[
+                system_message,
+                {
+                    "role": "user",
+                    "content": user_prompt
+                }
+            ],
+            model="llama-3.3-70b-versatile",
+            max_tokens=1500,
+            temperature=temperature,
+            stream=ctx is not None
+        )
+        
+        if ctx is None:
+            return response.choices[0].message.content
+        
+        pieces = []
+        async for chunk in response:
+            delta = chunk.choices[0].delta.content if chunk.choices else None
+            if delta:
+                pieces.append(delta)
+                await ctx.report_progress(progress=len(pieces), message=delta)
+    
+    return "".join(pieces)
+
+
 async def initialize_google_services() -> bool:
     """Initialize Google API services"""
     global gmail_service, calendar_service
     
     try:
+        loop = asyncio.get_running_loop()
         creds = None
         
         # Load existing token
@@ -66,7 +210,7 @@ async def initialize_google_services() -> bool:
         if not creds or not creds.valid:
             if creds and creds.expired and creds.refresh_token:
                 try:
-                    creds.refresh(Request())
+                    await loop.run_in_executor(None, creds.refresh, Request())
                 except Exception:
                     creds = None
             
@@ -77,16 +221,20 @@ async def initialize_google_services() -> bool:
                 flow = InstalledAppFlow.from_client_secrets_file(
                     str(CREDENTIALS_FILE), SCOPES
                 )
-                creds = flow.run_local_server(port=0)
+                creds = await loop.run_in_executor(None, lambda: flow.run_local_server(port=0))
             
             # Save credentials
             CONFIG_DIR.mkdir(exist_ok=True)
             with open(TOKEN_FILE, 'w') as token:
                 token.write(creds.to_json())
         
-        # Build services
-        gmail_service = build('gmail', 'v1', credentials=creds)
-        calendar_service = build('calendar', 'v3', credentials=creds)
+        # Build services on one authorized keep-alive connection shared by both APIs,
+        # from the discovery documents bundled with google-api-python-client
+        authed_http = AuthorizedHttp(creds, http=httplib2.Http(timeout=30))
+        gmail_service = build('gmail', 'v1', http=authed_http, model=OrjsonModel(),
+                              static_discovery=True, cache_discovery=False)
+        calendar_service = build('calendar', 'v3', http=authed_http, model=OrjsonModel(),
+                                 static_discovery=True, cache_discovery=False)
         
         return True
         
@@ -95,46 +243,151 @@ async def initialize_google_services() -> bool:
         return False
 
 
+def format_event_start(start: str) -> str:
+    """Normalize an event start (RFC 3339 dateTime or all-day date) to 'YYYY-MM-DD HH:MM'
+
+    Values that cannot be parsed are returned unchanged so one odd event
+    does not fail the whole listing.
+    """
+    value = start[:-1] + '+00:00' if start.endswith('Z') else start
+    try:
+        return datetime.fromisoformat(value).strftime('%Y-%m-%d %H:%M')
+    except ValueError:
+        return start
+
+
 def extract_email_body(payload: Dict) -> str:
-    """Extract email body from payload"""
+    """Extract email body from payload, searching nested multipart trees for text/plain"""
     body = ""
     
-    if payload.get('body') and payload['body'].get('data'):
-        body = base64.urlsafe_b64decode(payload['body']['data']).decode('utf-8', errors='ignore')
-    elif payload.get('parts'):
-        for part in payload['parts']:
-            if part.get('mimeType') == 'text/plain' and part.get('body') and part['body'].get('data'):
-                body = base64.urlsafe_b64decode(part['body']['data']).decode('utf-8', errors='ignore')
-                break
+    # Depth-first walk over the MIME tree with an explicit stack
+    stack = [payload]
+    while stack:
+        part = stack.pop()
+        data = (part.get('body') or {}).get('data')
+        
+        # The root carries the body of single-part messages whatever its type
+        if data and (part is payload or part.get('mimeType') == 'text/plain'):
+            body = b64.urlsafe_b64decode(data).decode('utf-8', errors='ignore')
+            break
+        
+        # Push children reversed so they are visited in document order
+        stack.extend(reversed(part.get('parts') or []))
     
     # Clean and limit body length
     body = body.replace('\n', ' ').strip()
     return body[:500]  # Limit to 500 characters
 
 
+def parse_message(msg: Dict, include_body: bool) -> Tuple[str, str, str, str]:
+    """Extract subject, sender, date and (optionally) body from a Gmail message in one pass"""
+    payload = msg['payload']
+    subject = from_addr = date_str = None
+    
+    # Single sweep over the headers, stopping once all three are found (first occurrence wins)
+    for header in payload.get('headers', []):
+        name = header['name']
+        if name == 'Subject':
+            if subject is None:
+                subject = header['value']
+        elif name == 'From':
+            if from_addr is None:
+                from_addr = header['value']
+        elif name == 'Date':
+            if date_str is None:
+                date_str = header['value']
+        else:
+            continue
+        if subject is not None and from_addr is not None and date_str is not None:
+            break
+    
+    # Metadata responses carry headers and snippet only
+    body = extract_email_body(payload) if include_body else ''
+    
+    return (
+        'No Subject' if subject is None else subject,
+        'Unknown' if from_addr is None else from_addr,
+        '' if date_str is None else date_str,
+        body
+    )
+
+
+async def fetch_messages(message_ids: List[str], detail_format: str) -> Dict[str, Dict]:
+    """Fetch Gmail messages by id in 'metadata' or 'full' format
+
+    Cached responses are reused and only the missing ids are requested,
+    EMAIL_BATCH_SIZE at a time per batch HTTP request.
+    """
+    if detail_format == 'metadata':
+        detail_params = {'format': 'metadata', 'metadataHeaders': EMAIL_METADATA_HEADERS}
+        cache = email_metadata_cache
+    else:
+        detail_params = {'format': detail_format}
+        cache = email_message_cache
+    
+    found = {}
+    missing_ids = []
+    for message_id in message_ids:
+        msg = cache.get(message_id)
+        if msg is None:
+            missing_ids.append(message_id)
+        else:
+            found[message_id] = msg
+    
+    fetched = {}
+    
+    def collect_message(request_id, msg, exception):
+        if exception is not None:
+            print(f"Error processing email: {exception}", file=sys.stderr)
+            return
+        fetched[request_id] = msg
+    
+    for start in range(0, len(missing_ids), EMAIL_BATCH_SIZE):
+        batch = gmail_service.new_batch_http_request(callback=collect_message)
+        for message_id in missing_ids[start:start + EMAIL_BATCH_SIZE]:
+            batch.add(
+                gmail_service.users().messages().get(
+                    userId='me',
+                    id=message_id,
+                    **detail_params
+                ),
+                request_id=message_id
+            )
+        await run_google_call(batch.execute)
+    
+    # Batch callbacks run on the Google worker thread; update the cache from the loop
+    for message_id, msg in fetched.items():
+        cache[message_id] = msg
+    
+    found.update(fetched)
+    return found
+
+
 @mcp.tool
-async def get_recent_emails(maxResults: int = 50) -> Dict[str, Any]:
-    """Get Gmail emails from the last 24 hours"""
+async def get_recent_emails(maxResults: int = 50, includeBody: bool = False) -> Dict[str, Any]:
+    """Get Gmail emails from the last 24 hours (bodies of the most relevant ones are fetched when includeBody is set)"""
     global gmail_service
     
-    if not gmail_service:
-        if not await initialize_google_services():
-            return {
-                "success": False,
-                "error": "Google services not configured. Please set up credentials."
-            }
+    if not await ensure_google_services():
+        return {
+            "success": False,
+            "error": "Google services not configured. Please set up credentials."
+        }
     
     try:
-        # Calculate 24 hours ago
-        yesterday = datetime.now() - timedelta(days=1)
-        query = f"after:{int(yesterday.timestamp())}"
-        
-        # Get message IDs
-        results = gmail_service.users().messages().list(
-            userId='me',
-            q=query,
-            maxResults=maxResults
-        ).execute()
+        # Get message IDs; the "last 24 hours" listing is reused for a few minutes
+        results = email_list_cache.get(maxResults)
+        if results is None:
+            # Calculate 24 hours ago
+            yesterday = datetime.now() - timedelta(days=1)
+            query = f"after:{int(yesterday.timestamp())}"
+            
+            results = await run_google_call(gmail_service.users().messages().list(
+                userId='me',
+                q=query,
+                maxResults=maxResults
+            ).execute)
+            email_list_cache[maxResults] = results
         
         messages = results.get('messages', [])
         
@@ -146,25 +399,33 @@ async def get_recent_emails(maxResults: int = 50) -> Dict[str, Any]:
                 "message": "No emails found in the last 24 hours"
             }
         
-        # Get detailed message info (limit to 10 for performance)
+        message_ids = [message['id'] for message in messages]
+        
+        # Pass 1: headers and snippets for every listed message
+        details = await fetch_messages(message_ids, 'metadata')
+        
+        # Pass 2: full bodies only for the most relevant messages (unread first, then listing order)
+        bodies = {}
+        if includeBody:
+            ranked_ids = sorted(
+                (message_id for message_id in message_ids if message_id in details),
+                key=lambda message_id: 'UNREAD' not in details[message_id].get('labelIds', [])
+            )
+            bodies = await fetch_messages(ranked_ids[:MAX_BODY_FETCH], 'full')
+        
+        # Parse in listing order
         emails = []
-        for message in messages[:10]:
+        for message_id in message_ids:
+            msg = details.get(message_id)
+            if msg is None:
+                continue
+            
             try:
-                msg = gmail_service.users().messages().get(
-                    userId='me',
-                    id=message['id'],
-                    format='full'
-                ).execute()
-                
-                headers = msg['payload'].get('headers', [])
-                
-                # Extract headers
-                subject = next((h['value'] for h in headers if h['name'] == 'Subject'), 'No Subject')
-                from_addr = next((h['value'] for h in headers if h['name'] == 'From'), 'Unknown')
-                date_str = next((h['value'] for h in headers if h['name'] == 'Date'), '')
-                
-                # Extract body
-                body = extract_email_body(msg['payload'])
+                full_msg = bodies.get(message_id)
+                if full_msg is not None:
+                    subject, from_addr, date_str, body = parse_message(full_msg, True)
+                else:
+                    subject, from_addr, date_str, body = parse_message(msg, False)
                 
                 email = {
                     'id': msg['id'],
@@ -200,35 +461,37 @@ async def get_upcoming_events(days: int = 7) -> Dict[str, Any]:
     """Get Google Calendar events for the next week"""
     global calendar_service
     
-    if not calendar_service:
-        if not await initialize_google_services():
-            return {
-                "success": False,
-                "error": "Google services not configured. Please set up credentials."
-            }
+    if not await ensure_google_services():
+        return {
+            "success": False,
+            "error": "Google services not configured. Please set up credentials."
+        }
     
     try:
         now = datetime.now()
         end_date = now + timedelta(days=days)
         
-        events_result = calendar_service.events().list(
+        events_result = await run_google_call(calendar_service.events().list(
             calendarId='primary',
             timeMin=now.isoformat() + 'Z',
             timeMax=end_date.isoformat() + 'Z',
             maxResults=50,
             singleEvents=True,
             orderBy='startTime'
-        ).execute()
+        ).execute)
         
         events = events_result.get('items', [])
         
         formatted_events = []
         for event in events:
+            start = event['start'].get('dateTime', event['start'].get('date'))
             formatted_event = {
                 'id': event['id'],
                 'title': event.get('summary', 'No Title'),
                 'description': event.get('description', ''),
-                'start': event['start'].get('dateTime', event['start'].get('date')),
+                'start': start,
+                # Parsed once here so analyze_calendar_ai does not have to
+                'start_parsed': format_event_start(start) if start else '',
                 'end': event['end'].get('dateTime', event['end'].get('date')),
                 'location': event.get('location', ''),
                 'attendees': [a.get('email', '') for a in event.get('attendees', [])]
@@ -249,7 +512,7 @@ async def get_upcoming_events(days: int = 7) -> Dict[str, Any]:
 
 
 @mcp.tool
-async def summarize_emails_ai(emails: List[Dict[str, Any]]) -> Dict[str, Any]:
+async def summarize_emails_ai(emails: List[Dict[str, Any]], ctx: Optional[Context] = None) -> Dict[str, Any]:
     """Summarize emails using Groq AI"""
     global groq_client
     
@@ -267,36 +530,50 @@ async def summarize_emails_ai(emails: List[Dict[str, Any]]) -> Dict[str, Any]:
             }
         
         # Prepare email text for AI
-        email_text = []
-        for email in emails:
-            text = f"Subject: {email.get('subject', '')}\n"
-            text += f"From: {email.get('from', '')}\n"
-            text += f"Date: {email.get('date', '')}\n"
-            text += f"Content: {email.get('snippet', '') or email.get('body', '')}"
-            email_text.append(text)
+        email_text = [
+            f"Subject: {email.get('subject', '')}\n"
+            f"From: {email.get('from', '')}\n"
+            f"Date: {email.get('date', '')}\n"
+            f"Content: {email.get('snippet', '') or email.get('body', '')}"
+            for email in emails
+        ]
         
         combined_text = "\n\n---\n\n".join(email_text)
         
+        cache_key = ('summary', prompt_fingerprint(combined_text))
+        summary = ai_response_cache.get(cache_key)
+        if summary is not None:
+            return {
+                "success": True,
+                "summary": summary,
+                "email_count": len(emails)
+            }
+        
         # Call Groq API
-        response = groq_client.chat.completions.create(
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are an AI assistant that helps summarize emails efficiently. Provide a clear, organized summary of the key points from the emails, grouping similar topics together and highlighting important items that need attention."
-                },
-                {
-                    "role": "user",
-                    "content": f"Please summarize these emails from the last 24 hours. Focus on the most important items and group similar topics:\n\n{combined_text}"
-                }
-            ],
-            model="llama-3.3-70b-versatile",
-            max_tokens=1500,
-            temperature=0.3
-        )
+        if len(email_text) > SUMMARY_CHUNK_THRESHOLD:
+            # Summarize chunks concurrently, then merge the partial summaries
+            chunks = [
+                email_text[i:i + SUMMARY_CHUNK_SIZE]
+                for i in range(0, len(email_text), SUMMARY_CHUNK_SIZE)
+            ]
+            partial_summaries = await asyncio.gather(*[
+                groq_complete(SUMMARIZE_SYSTEM_MESSAGE, SUMMARIZE_PROMPT_PREFIX + "\n\n---\n\n".join(chunk), 0.3)
+                for chunk in chunks
+            ])
+            summary = await groq_complete(
+                SUMMARIZE_SYSTEM_MESSAGE,
+                SUMMARIZE_MERGE_PROMPT_PREFIX + "\n\n---\n\n".join(partial_summaries),
+                0.3,
+                ctx
+            )
+        else:
+            summary = await groq_complete(SUMMARIZE_SYSTEM_MESSAGE, SUMMARIZE_PROMPT_PREFIX + combined_text, 0.3, ctx)
+        
+        ai_response_cache[cache_key] = summary
         
         return {
             "success": True,
-            "summary": response.choices[0].message.content,
+            "summary": summary,
             "email_count": len(emails)
         }
         
@@ -308,7 +585,7 @@ async def summarize_emails_ai(emails: List[Dict[str, Any]]) -> Dict[str, Any]:
 
 
 @mcp.tool
-async def analyze_calendar_ai(events: List[Dict[str, Any]]) -> Dict[str, Any]:
+async def analyze_calendar_ai(events: List[Dict[str, Any]], ctx: Optional[Context] = None) -> Dict[str, Any]:
     """Analyze calendar events using Groq AI"""
     global groq_client
     
@@ -328,39 +605,43 @@ async def analyze_calendar_ai(events: List[Dict[str, Any]]) -> Dict[str, Any]:
         # Prepare events text for AI
         events_text = []
         for event in events:
-            text = f"Event: {event.get('title', '')}\n"
-            
-            if event.get('start'):
-                start_time = datetime.fromisoformat(event['start'].replace('Z', '+00:00'))
-                text += f"Time: {start_time.strftime('%Y-%m-%d %H:%M')}\n"
-            
-            text += f"Description: {event.get('description', 'No description')}\n"
-            text += f"Location: {event.get('location', 'No location')}"
+            # Events from get_upcoming_events carry a pre-parsed start; parse others once
+            start_parsed = event.get('start_parsed')
+            if not start_parsed and event.get('start'):
+                start_parsed = format_event_start(event['start'])
+            time_line = f"Time: {start_parsed}\n" if start_parsed else ""
             
-            events_text.append(text)
+            events_text.append(
+                f"Event: {event.get('title', '')}\n"
+                f"{time_line}"
+                f"Description: {event.get('description', 'No description')}\n"
+                f"Location: {event.get('location', 'No location')}"
+            )
         
         combined_text = "\n\n---\n\n".join(events_text)
         
+        cache_key = ('analysis', prompt_fingerprint(combined_text))
+        analysis = ai_response_cache.get(cache_key)
+        if analysis is not None:
+            return {
+                "success": True,
+                "analysis": analysis,
+                "event_count": len(events)
+            }
+        
         # Call Groq API
-        response = groq_client.chat.completions.create(
-            messages=[
-                {
-                    "role": "system",
-                    "content": "You are an AI assistant that analyzes calendar events and provides helpful insights, time management suggestions, and preparation recommendations. Focus on identifying important meetings, potential conflicts, preparation needs, and optimization opportunities."
-                },
-                {
-                    "role": "user",
-                    "content": f"Analyze these upcoming calendar events and provide insights, suggestions, and recommendations for better time management and preparation:\n\n{combined_text}"
-                }
-            ],
-            model="llama-3.3-70b-versatile",
-            max_tokens=1500,
-            temperature=0.4
+        analysis = await groq_complete(
+            ANALYZE_SYSTEM_MESSAGE,
+            ANALYZE_PROMPT_PREFIX + combined_text,
+            0.4,
+            ctx
         )
         
+        ai_response_cache[cache_key] = analysis
+        
         return {
             "success": True,
-            "analysis": response.choices[0].message.content,
+            "analysis": analysis,
             "event_count": len(events)
         }
         
@@ -371,21 +652,29 @@ async def analyze_calendar_ai(events: List[Dict[str, Any]]) -> Dict[str, Any]:
         }
 
 
-@mcp.tool
-async def search_web_insights(query: str, context: str = "") -> Dict[str, Any]:
-    """Search web for insights (placeholder implementation)"""
+@lru_cache(maxsize=1024)
+def search_web_results(query: str, context: str) -> Tuple[Dict[str, str], ...]:
+    """Compute search results for a (query, context) pair; memoized since repeated queries are common"""
     # Mock implementation - in production, integrate with Google Custom Search API
-    mock_results = [
+    # (and switch to a TTL cache so real results do not go stale)
+    return (
         {
             'title': f'Insights for: {query}',
             'link': 'https://example.com',
             'snippet': f'Based on your search for "{query}", here are some general insights and recommendations with context: {context}'
-        }
-    ]
+        },
+    )
+
+
+@mcp.tool
+async def search_web_insights(query: str, context: str = "") -> Dict[str, Any]:
+    """Search web for insights (placeholder implementation)"""
+    # Copy the cached result dicts so callers cannot mutate the memoized entries
+    results = [dict(result) for result in search_web_results(query, context)]
     
     return {
         "success": True,
-        "results": mock_results,
+        "results": results,
         "query": query,
         "context": context,
         "note": "Web search integration requires Google Custom Search API setup"
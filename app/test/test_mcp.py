@@ -2,11 +2,40 @@
 """
 Test MCP communication directly
 """
-import json
+import os
+import selectors
 import subprocess
 import sys
 import time
 
+import orjson
+
+
+def read_line(process, buffer, timeout):
+    """Read one newline-terminated message from the server's stdout (unbuffered, binary)"""
+    deadline = time.monotonic() + timeout
+    with selectors.DefaultSelector() as selector:
+        selector.register(process.stdout, selectors.EVENT_READ)
+        while b"\n" not in buffer:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not selector.select(remaining):
+                raise TimeoutError(f"No response from server within {timeout}s")
+            chunk = os.read(process.stdout.fileno(), 65536)
+            if not chunk:
+                raise EOFError("Server closed stdout")
+            buffer.extend(chunk)
+    
+    line, _, rest = bytes(buffer).partition(b"\n")
+    buffer[:] = rest
+    return line.decode()
+
+
+def send_message(process, message):
+    """Write one JSON-RPC message to the server's stdin"""
+    process.stdin.write(orjson.dumps(message) + b"\n")
+    process.stdin.flush()
+
+
 def test_mcp_server():
     print("🧪 Testing MCP server communication...")
     
@@ -17,16 +46,13 @@ def test_mcp_server():
             ["python", server_path],
             stdin=subprocess.PIPE,
             stdout=subprocess.PIPE,
-            stderr=subprocess.PIPE,
-            text=True,
-            bufsize=1
+            stderr=None,  # inherit, so server errors stay visible without an unread pipe
+            bufsize=0
         )
+        buffer = bytearray()
         
         print("✅ Server started, PID:", process.pid)
         
-        # Wait a bit for server to initialize
-        time.sleep(3)
-        
         # Send initialization request
         initialize_request = {
             "jsonrpc": "2.0",
@@ -44,12 +70,13 @@ def test_mcp_server():
             }
         }
         
+        # The request waits in the pipe until the server is ready, so the response
+        # itself serves as the readiness probe (no fixed startup sleep)
         print("📤 Sending initialize request...")
-        process.stdin.write(json.dumps(initialize_request) + "\n")
-        process.stdin.flush()
+        send_message(process, initialize_request)
         
         # Read response
-        response_line = process.stdout.readline()
+        response_line = read_line(process, buffer, timeout=30)
         print("📥 Initialize response:", response_line.strip())
         
         # Send initialized notification
@@ -59,11 +86,7 @@ def test_mcp_server():
         }
         
         print("📤 Sending initialized notification...")
-        process.stdin.write(json.dumps(initialized_notification) + "\n")
-        process.stdin.flush()
-        
-        # Wait a moment
-        time.sleep(1)
+        send_message(process, initialized_notification)
         
         # Send tool call
         tool_request = {
@@ -79,11 +102,10 @@ def test_mcp_server():
         }
         
         print("📤 Sending tool call...")
-        process.stdin.write(json.dumps(tool_request) + "\n")
-        process.stdin.flush()
+        send_message(process, tool_request)
         
         # Read response
-        response_line = process.stdout.readline()
+        response_line = read_line(process, buffer, timeout=10)
         print("📥 Tool response:", response_line.strip())
         
         # Clean up